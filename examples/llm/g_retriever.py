@@ -115,7 +115,8 @@ def get_loss(model, batch, model_save_name="gnn+llm") -> Tensor:
             batch.batch,  # which node belongs to which batch index
             batch.label,  # list answers (labels)
             batch.edge_attr,  # edge attributes
-            batch.desc  # list of text graph descriptions
+            batch.desc,  # list of text graph descriptions
+            ptr=batch.ptr,  # segment boundaries for graph pooling
         )
 
 
@@ -142,4 +143,4 @@ def inference_step(model, batch, model_save_name="gnn+llm",
         normalize_batch_dtype(batch)
         return model.inference(batch.question, batch.x, batch.edge_index,
                                batch.batch, batch.edge_attr, batch.desc,
-                               max_out_tokens=max_out_tokens)
+                               max_out_tokens=max_out_tokens, ptr=batch.ptr)
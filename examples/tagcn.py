@@ -1,26 +1,40 @@
+import argparse
 import os.path as osp
+import statistics
+import time
 
 import torch
 import torch.nn.functional as F
 
+import torch_geometric
 import torch_geometric.transforms as T
+from torch_geometric import EdgeIndex
 from torch_geometric.datasets import Planetoid
-from torch_geometric.nn import TAGConv
+from torch_geometric.nn import CuGraphTAGConv, TAGConv
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--use-cugraph', action='store_true',
+                    help='Use the fused cugraph-ops implementation')
+args = parser.parse_args()
 
 dataset = 'Cora'
 path = osp.join(osp.dirname(osp.realpath(__file__)), '..', 'data', dataset)
 dataset = Planetoid(path, dataset, transform=T.NormalizeFeatures())
 data = dataset[0]
 
+torch_geometric.seed_everything(42)
+# Enable TF32 tensor cores for float32 matrix multiplications on Ampere+:
+torch.set_float32_matmul_precision('high')
+
 
 class Net(torch.nn.Module):
     def __init__(self):
         super().__init__()
-        self.conv1 = TAGConv(dataset.num_features, 16)
-        self.conv2 = TAGConv(16, dataset.num_classes)
+        Conv = CuGraphTAGConv if args.use_cugraph else TAGConv
+        self.conv1 = Conv(dataset.num_features, 16)
+        self.conv2 = Conv(16, dataset.num_classes)
 
-    def forward(self):
-        x, edge_index = data.x, data.edge_index
+    def forward(self, x, edge_index):
         x = F.relu(self.conv1(x, edge_index))
         x = F.dropout(x, training=self.training)
         x = self.conv2(x, edge_index)
@@ -35,33 +49,62 @@ else:
     device = torch.device('cpu')
 
 model, data = Net().to(device), data.to(device)
+if args.use_cugraph:
+    # Convert to sorted CSC form once, outside the training loop:
+    num_nodes = data.num_nodes
+    data.edge_index = EdgeIndex(
+        data.edge_index,
+        sparse_size=(num_nodes, num_nodes),
+    ).sort_by('col')[0]
+if not args.use_cugraph:
+    # Compile the model into an optimized version; Cora is a single static
+    # graph, so capturing under static shapes avoids recompiles. The
+    # cugraph-ops kernels cannot be captured by torch.compile:
+    model = torch.compile(model, dynamic=False)
 optimizer = torch.optim.Adam(model.parameters(), lr=0.01, weight_decay=5e-4)
 
 
 def train():
     model.train()
     optimizer.zero_grad()
-    F.nll_loss(model()[data.train_mask], data.y[data.train_mask]).backward()
+    out = model(data.x, data.edge_index)
+    F.nll_loss(out[data.train_mask], data.y[data.train_mask]).backward()
     optimizer.step()
 
 
+# The masks are static, so stack them once instead of per evaluation:
+masks = torch.stack([data.train_mask, data.val_mask, data.test_mask])
+
+
 @torch.no_grad()
 def test():
     model.eval()
-    out, accs = model(), []
-    for _, mask in data('train_mask', 'val_mask', 'test_mask'):
-        pred = out[mask].argmax(1)
-        acc = pred.eq(data.y[mask]).sum().item() / mask.sum().item()
-        accs.append(acc)
-    return accs
+    pred = model(data.x, data.edge_index).argmax(1)
+    # Compute all accuracies on-device and synchronize only once:
+    correct = (pred == data.y).unsqueeze(0) & masks
+    accs = correct.sum(1) / masks.sum(1)
+    return accs.tolist()
+
 
+train()  # Warmup to exclude compilation time from the timed loop below.
 
 best_val_acc = test_acc = 0
+times = []
 for epoch in range(1, 201):
+    # Synchronize so that `times` measures GPU work, not launch latency:
+    if device.type == 'cuda':
+        torch.cuda.synchronize()
+    start = time.time()
     train()
+    if device.type == 'cuda':
+        torch.cuda.synchronize()
+    times.append(time.time() - start)
     train_acc, val_acc, tmp_test_acc = test()
     if val_acc > best_val_acc:
         best_val_acc = val_acc
         test_acc = tmp_test_acc
-    print(f'Epoch: {epoch:03d}, Train: {train_acc:.4f}, '
-          f'Val: {best_val_acc:.4f}, Test: {test_acc:.4f}')
+    if epoch % 10 == 0 or epoch == 200:
+        print(f'Epoch: {epoch:03d}, Train: {train_acc:.4f}, '
+              f'Val: {best_val_acc:.4f}, Test: {test_acc:.4f}')
+print(f'Mean time per epoch: {sum(times) / len(times):.4f}s')
+print(f'Median time per epoch: {statistics.median(times):.4f}s')
@@ -0,0 +1,32 @@
+import torch
+
+from torch_geometric.nn.attention import BigBirdAttention, BigBirdEncoder
+
+
+def test_bigbird_attention():
+    x = torch.randn(1, 4, 16)
+    mask = torch.ones([1, 4], dtype=torch.bool)
+    attn = BigBirdAttention(channels=16, heads=4, block_size=2)
+    out = attn(x, mask)
+    assert out.shape == (1, 4, 16)
+    assert str(attn) == ('BigBirdAttention(heads=4, '
+                         'head_channels=64, block_size=2)')
+
+
+def test_bigbird_attention_block_sparse():
+    # Long enough for the sparse path (more than five blocks), with padding:
+    x = torch.randn(2, 21, 16)
+    mask = torch.ones([2, 21], dtype=torch.bool)
+    mask[1, 15:] = False
+    attn = BigBirdAttention(channels=16, heads=4, block_size=2)
+    out = attn(x, mask)
+    assert out.shape == (2, 21, 16)
+
+
+def test_bigbird_encoder():
+    x = torch.randn(1, 21, 16)
+    mask = torch.ones([1, 21], dtype=torch.bool)
+    encoder = BigBirdEncoder(channels=16, heads=4, num_layers=2, block_size=2)
+    out = encoder(x, mask)
+    assert out.shape == (1, 21, 16)
+    assert str(encoder) == 'BigBirdEncoder(num_layers=2, block_size=2)'
@@ -0,0 +1,60 @@
+import pytest
+import torch
+
+from torch_geometric import EdgeIndex
+from torch_geometric.nn import CuGraphTAGConv, TAGConv
+from torch_geometric.testing import onlyCUDA, withPackage
+
+
+@onlyCUDA
+@withPackage('pylibcugraphops>=23.02')
+@pytest.mark.parametrize('K', [1, 3])
+@pytest.mark.parametrize('bias', [True, False])
+def test_tag_conv_equality(K, bias):
+    in_channels, out_channels = (8, 16)
+
+    x = torch.rand(10, in_channels, device='cuda')
+    edge_index = torch.tensor([
+        [7, 0, 0, 0, 0, 0, 0, 1, 2, 3, 4, 5, 6, 8, 9],
+        [0, 1, 2, 3, 4, 5, 6, 7, 7, 7, 7, 7, 7, 7, 7],
+    ], device='cuda')
+
+    # With sum aggregation, `CuGraphTAGConv` matches the un-normalized
+    # `TAGConv`:
+    conv1 = TAGConv(in_channels, out_channels, K=K, bias=bias,
+                    normalize=False).cuda()
+    conv2 = CuGraphTAGConv(in_channels, out_channels, K=K, aggr='sum',
+                           bias=bias).cuda()
+
+    with torch.no_grad():
+        for lin1, lin2 in zip(conv1.lins, conv2.lins):
+            lin2.weight.data[:] = lin1.weight.data
+        if bias:
+            conv2.bias.data[:] = conv1.bias.data
+
+    out1 = conv1(x, edge_index)
+    out2 = conv2(x, EdgeIndex(edge_index, sparse_size=(10, 10)))
+    assert torch.allclose(out1, out2, atol=1e-6)
+
+
+@onlyCUDA
+@withPackage('pylibcugraphops>=23.02')
+def test_tag_conv_mean_aggr():
+    x = torch.rand(4, 8, device='cuda')
+    edge_index = torch.tensor([
+        [1, 2, 3],
+        [0, 0, 1],
+    ], device='cuda')
+
+    conv = CuGraphTAGConv(8, 16, K=1).cuda()
+    assert str(conv) == 'CuGraphTAGConv(8, 16, K=1, aggr=mean)'
+
+    out = conv(x, EdgeIndex(edge_index, sparse_size=(4, 4)))
+    assert out.size() == (4, 16)
+
+    # Hand-computed mean aggregation of the single hop:
+    agg = torch.zeros_like(x)
+    agg[0] = (x[1] + x[2]) / 2
+    agg[1] = x[3]
+    expected = conv.lins[0](x) + conv.lins[1](agg) + conv.bias
+    assert torch.allclose(out, expected, atol=1e-6)
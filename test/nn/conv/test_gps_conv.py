@@ -7,7 +7,7 @@ from torch_geometric.typing import SparseTensor
 from torch_geometric.utils import to_torch_csc_tensor
 
 
-@pytest.mark.parametrize('attn_type', ['multihead', 'performer'])
+@pytest.mark.parametrize('attn_type', ['multihead', 'performer', 'bigbird'])
 @pytest.mark.parametrize('norm', [None, 'batch_norm', 'layer_norm'])
 def test_gps_conv(norm, attn_type):
     x = torch.randn(4, 16)
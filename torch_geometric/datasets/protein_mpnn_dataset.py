@@ -1,8 +1,18 @@
 import os
 import pickle
 import random
-from collections import defaultdict
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import numpy as np
 import torch
@@ -15,6 +25,17 @@ from torch_geometric.data import (
     extract_tar,
 )
 
+_AA_ALPHABET = 'ACDEFGHIKLMNPQRSTVWYX'
+# Maps residue byte values to label indices; unknown residues map to 'X':
+_AA_LABEL_TABLE = np.full(256, _AA_ALPHABET.index('X'), dtype=np.int32)
+_AA_LABEL_TABLE[np.frombuffer(_AA_ALPHABET.encode(), dtype=np.uint8)] = \
+    np.arange(len(_AA_ALPHABET), dtype=np.int32)
+
+_CHAIN_ALPHABET: List[str] = list(
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz') + [
+        str(i) for i in range(300)
+    ]
+
 
 class ProteinMPNNDataset(InMemoryDataset):
     r"""The ProteinMPNN dataset from the `"Robust deep learning based protein
@@ -118,62 +139,72 @@ class ProteinMPNNDataset(InMemoryDataset):
         os.unlink(file_path)
 
     def process(self) -> None:
-        alphabet_set = set(list('ACDEFGHIKLMNPQRSTVWYX'))
+        alphabet_set = set(_AA_ALPHABET)
         cluster_ids = self._process_split()
-        total_items = sum(len(items) for items in cluster_ids.values())
-        data_list = []
-
-        with tqdm(total=total_items, desc="Processing") as pbar:
-            for _, items in cluster_ids.items():
-                for chain_id, _ in items:
-                    item = self._process_pdb1(chain_id)
-
-                    if 'label' not in item:
-                        pbar.update(1)
-                        continue
-                    if len(list(np.unique(item['idx']))) >= 352:
-                        pbar.update(1)
-                        continue
-
-                    my_dict = self._process_pdb2(item)
-
-                    if len(my_dict['seq']) > self.max_length:
-                        pbar.update(1)
-                        continue
-                    bad_chars = set(list(
-                        my_dict['seq'])).difference(alphabet_set)
-                    if len(bad_chars) > 0:
-                        pbar.update(1)
-                        continue
-
-                    x_chain_all, chain_seq_label_all, mask, chain_mask_all, residue_idx, chain_encoding_all = self._process_pdb3(  # noqa: E501
-                        my_dict)
-
-                    data = Data(
-                        x=x_chain_all,  # [seq_len, 4, 3]
-                        chain_seq_label=chain_seq_label_all,  # [seq_len]
-                        mask=mask,  # [seq_len]
-                        chain_mask_all=chain_mask_all,  # [seq_len]
-                        residue_idx=residue_idx,  # [seq_len]
-                        chain_encoding_all=chain_encoding_all,  # [seq_len]
-                    )
-
-                    if self.pre_filter is not None and not self.pre_filter(
-                            data):
-                        continue
-                    if self.pre_transform is not None:
-                        data = self.pre_transform(data)
-
-                    data_list.append(data)
-
-                    if len(data_list) >= self.num_units:
-                        pbar.update(total_items - pbar.n)
-                        break
+        chain_ids = [
+            chain_id for items in cluster_ids.values() for chain_id, _ in items
+        ]
+        total_items = len(chain_ids)
+        data_list: List[Data] = []
+
+        with tqdm(total=total_items, desc="Processing") as pbar, \
+                ThreadPoolExecutor(max_workers=8) as executor:
+            # Prefetch upcoming PDB files while the current one is processed:
+            futures: Deque = deque(
+                executor.submit(self._process_pdb1, chain_id)
+                for chain_id in chain_ids[:8])
+            num_submitted = len(futures)
+
+            while len(futures) > 0:
+                item = futures.popleft().result()
+                if num_submitted < total_items:
+                    futures.append(
+                        executor.submit(self._process_pdb1,
+                                        chain_ids[num_submitted]))
+                    num_submitted += 1
+
+                if 'label' not in item:
                     pbar.update(1)
-                else:
                     continue
-                break
-            self.save(data_list, self.processed_paths[self.splits[self.split]])
+                if np.unique(item['idx']).size >= 352:
+                    pbar.update(1)
+                    continue
+
+                my_dict = self._process_pdb2(item)
+
+                if len(my_dict['seq']) > self.max_length:
+                    pbar.update(1)
+                    continue
+                bad_chars = set(list(my_dict['seq'])).difference(alphabet_set)
+                if len(bad_chars) > 0:
+                    pbar.update(1)
+                    continue
+
+                x_chain_all, chain_seq_label_all, mask, chain_mask_all, residue_idx, chain_encoding_all = self._process_pdb3(  # noqa: E501
+                    my_dict)
+
+                data = Data(
+                    x=x_chain_all,  # [seq_len, 4, 3]
+                    chain_seq_label=chain_seq_label_all,  # [seq_len]
+                    mask=mask,  # [seq_len]
+                    chain_mask_all=chain_mask_all,  # [seq_len]
+                    residue_idx=residue_idx,  # [seq_len]
+                    chain_encoding_all=chain_encoding_all,  # [seq_len]
+                )
+
+                if self.pre_filter is not None and not self.pre_filter(data):
+                    continue
+                if self.pre_transform is not None:
+                    data = self.pre_transform(data)
+
+                data_list.append(data)
+
+                if len(data_list) >= self.num_units:
+                    pbar.update(total_items - pbar.n)
+                    break
+                pbar.update(1)
+
+        self.save(data_list, self.processed_paths[self.splits[self.split]])
 
     def _process_split(self) -> Dict[int, List[Tuple[str, int]]]:
         import pandas as pd
@@ -222,7 +253,7 @@ class ProteinMPNNDataset(InMemoryDataset):
         # load metadata
         if not os.path.isfile(f'{prefix}.pt'):
             return {'seq': np.zeros(5)}
-        meta = torch.load(f'{prefix}.pt')
+        meta = torch.load(f'{prefix}.pt', mmap=True, weights_only=True)
         asmb_ids = meta['asmb_ids']
         asmb_chains = meta['asmb_chains']
         chids = np.array(meta['chains'])
@@ -236,13 +267,14 @@ class ProteinMPNNDataset(InMemoryDataset):
         # if the chains is missing is missing from all the assemblies
         # then return this chain alone
         if len(asmb_candidates) < 1:
-            chain = torch.load(f'{prefix}_{chid}.pt')
+            chain = torch.load(f'{prefix}_{chid}.pt', mmap=True,
+                               weights_only=True)
             L = len(chain['seq'])
             return {
                 'seq': chain['seq'],
                 'xyz': chain['xyz'],
-                'idx': torch.zeros(L).int(),
-                'masked': torch.Tensor([0]).int(),
+                'idx': torch.zeros(L, dtype=torch.int32),
+                'masked': torch.zeros(1, dtype=torch.int32),
                 'label': chain_id,
             }
 
@@ -254,7 +286,7 @@ class ProteinMPNNDataset(InMemoryDataset):
 
         # load relevant chains
         chains = {
-            c: torch.load(f'{prefix}_{c}.pt')
+            c: torch.load(f'{prefix}_{c}.pt', mmap=True, weights_only=True)
             for i in idx
             for c in asmb_chains[i] if c in meta['chains']
         }
@@ -271,20 +303,24 @@ class ProteinMPNNDataset(InMemoryDataset):
             # select chains which k-th xform should be applied to
             s1 = set(meta['chains'])
             s2 = set(asmb_chains[k].split(','))
-            chains_k = s1 & s2
-
-            # transform selected chains
-            for c in chains_k:
-                try:
-                    xyz = chains[c]['xyz']
-                    xyz_ru = torch.einsum('bij,raj->brai', u, xyz) + r[:, None,
-                                                                       None, :]
-                    asmb.update({
-                        (c, k, i): xyz_i
-                        for i, xyz_i in enumerate(xyz_ru)
-                    })
-                except KeyError:
-                    return {'seq': np.zeros(5)}
+            chains_k = list(s1 & s2)
+
+            if any(c not in chains for c in chains_k):
+                return {'seq': np.zeros(5)}
+            if len(chains_k) == 0:
+                continue
+
+            # transform all selected chains in a single kernel by
+            # concatenating them along the residue dimension:
+            sizes = [chains[c]['xyz'].shape[0] for c in chains_k]
+            xyz = torch.cat([chains[c]['xyz'] for c in chains_k], dim=0)
+            xyz_ru = torch.einsum('bij,raj->brai', u, xyz) + r[:, None,
+                                                               None, :]
+            for c, xyz_c in zip(chains_k, xyz_ru.split(sizes, dim=1)):
+                asmb.update({
+                    (c, k, i): xyz_i
+                    for i, xyz_i in enumerate(xyz_c)
+                })
 
         # select chains which share considerable similarity to chid
         seqid = meta['tm'][chids == chid][0, :, 1]
@@ -293,13 +329,11 @@ class ProteinMPNNDataset(InMemoryDataset):
             for seqid_j, ch_j in zip(seqid, chids) if seqid_j > self.homo
         }
         # stack all chains in the assembly together
-        seq: str = ''
         xyz_all: List[torch.Tensor] = []
         idx_all: List[torch.Tensor] = []
         masked: List[int] = []
-        seq_list = []
+        seq_list: List[str] = []
         for counter, (k, v) in enumerate(asmb.items()):
-            seq += chains[k[0]]['seq']
             seq_list.append(chains[k[0]]['seq'])
             xyz_all.append(v)
             idx_all.append(torch.full((v.shape[0], ), counter))
@@ -307,68 +341,58 @@ class ProteinMPNNDataset(InMemoryDataset):
                 masked.append(counter)
 
         return {
-            'seq': seq,
+            'seq': ''.join(seq_list),
             'xyz': torch.cat(xyz_all, dim=0),
             'idx': torch.cat(idx_all, dim=0),
-            'masked': torch.Tensor(masked).int(),
+            'masked': torch.as_tensor(masked, dtype=torch.int32),
             'label': chain_id,
         }
 
     def _process_pdb2(self, t: Dict[str, Any]) -> Dict[str, Any]:
-        init_alphabet = list(
-            'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz')
-        extra_alphabet = [str(item) for item in list(np.arange(300))]
-        chain_alphabet = init_alphabet + extra_alphabet
         my_dict: Dict[str, Union[str, int, Dict[str, Any], List[Any]]] = {}
-        concat_seq = ''
+        concat_seq: List[str] = []
         mask_list = []
         visible_list = []
-        for idx in list(np.unique(t['idx'])):
-            letter = chain_alphabet[idx]
-            res = np.argwhere(t['idx'] == idx)
-            initial_sequence = "".join(list(
-                np.array(list(t['seq']))[res][
-                    0,
-                ]))
-            if initial_sequence[-6:] == "HHHHHH":
-                res = res[:, :-6]
-            if initial_sequence[0:6] == "HHHHHH":
-                res = res[:, 6:]
-            if initial_sequence[-7:-1] == "HHHHHH":
-                res = res[:, :-7]
-            if initial_sequence[-8:-2] == "HHHHHH":
-                res = res[:, :-8]
-            if initial_sequence[-9:-3] == "HHHHHH":
-                res = res[:, :-9]
-            if initial_sequence[-10:-4] == "HHHHHH":
-                res = res[:, :-10]
-            if initial_sequence[1:7] == "HHHHHH":
-                res = res[:, 7:]
-            if initial_sequence[2:8] == "HHHHHH":
-                res = res[:, 8:]
-            if initial_sequence[3:9] == "HHHHHH":
-                res = res[:, 9:]
-            if initial_sequence[4:10] == "HHHHHH":
-                res = res[:, 10:]
-            if res.shape[1] >= 4:
-                chain_seq = "".join(list(np.array(list(t['seq']))[res][0]))
+        seq_arr = np.frombuffer(t['seq'].encode(), dtype='S1')
+        xyz_arr = np.asarray(t['xyz'])
+        # Bucket residues by chain via a single stable sort instead of one
+        # full scan over the index array per chain:
+        idx_arr = np.asarray(t['idx'])
+        order = np.argsort(idx_arr, kind='stable')
+        uniq, starts = np.unique(idx_arr[order], return_index=True)
+        ends = np.append(starts[1:], idx_arr.size)
+        for idx, start, end in zip(uniq, starts, ends):
+            letter = _CHAIN_ALPHABET[idx]
+            res = order[start:end]
+            initial_sequence = seq_arr[res].tobytes().decode()
+            # Strip polyhistidine tags within the first/last 10 residues:
+            tail = initial_sequence.rfind('HHHHHH',
+                                          len(initial_sequence) - 10)
+            if tail != -1:
+                res = res[:tail]
+            head = initial_sequence.find('HHHHHH', 0, 10)
+            if head != -1:
+                res = res[head + 6:]
+            if res.size >= 4:
+                chain_seq = seq_arr[res].tobytes().decode()
                 my_dict[f'seq_chain_{letter}'] = chain_seq
-                concat_seq += chain_seq
+                concat_seq.append(chain_seq)
                 if idx in t['masked']:
                     mask_list.append(letter)
                 else:
                     visible_list.append(letter)
                 coords_dict_chain = {}
-                all_atoms = np.array(t['xyz'][res])[0]  # [L, 14, 3]
+                all_atoms = np.ascontiguousarray(  # [L, 14, 3]
+                    xyz_arr[res].astype(np.float32, copy=False))
                 for i, c in enumerate(['N', 'CA', 'C', 'O']):
                     coords_dict_chain[
-                        f'{c}_chain_{letter}'] = all_atoms[:, i, :].tolist()
+                        f'{c}_chain_{letter}'] = all_atoms[:, i, :]
                 my_dict[f'coords_chain_{letter}'] = coords_dict_chain
         my_dict['name'] = t['label']
         my_dict['masked_list'] = mask_list
         my_dict['visible_list'] = visible_list
         my_dict['num_of_chains'] = len(mask_list) + len(visible_list)
-        my_dict['seq'] = concat_seq
+        my_dict['seq'] = ''.join(concat_seq)
         return my_dict
 
     def _process_pdb3(
@@ -431,10 +455,9 @@ class ProteinMPNNDataset(InMemoryDataset):
         chain_mask_all = np.concatenate(chain_mask_list, 0)
         chain_encoding_all = np.concatenate(chain_encoding_list, 0)
 
-        # Convert to labels
-        alphabet = 'ACDEFGHIKLMNPQRSTVWYX'
-        chain_seq_label_all = np.asarray(
-            [alphabet.index(a) for a in chain_seq_all], dtype=np.int32)
+        # Convert to labels via a byte-level lookup table:
+        chain_seq_label_all = _AA_LABEL_TABLE[np.frombuffer(
+            chain_seq_all.encode(), dtype=np.uint8)]
 
         isnan = np.isnan(x_chain_all)
         mask = np.isfinite(np.sum(x_chain_all, (1, 2))).astype(np.float32)
@@ -4,7 +4,7 @@ import torch
 from torch import Tensor
 
 from torch_geometric.llm.models.llm import LLM, MAX_NEW_TOKENS
-from torch_geometric.utils import scatter
+from torch_geometric.utils import scatter, segment
 
 
 class GRetriever(torch.nn.Module):
@@ -94,6 +94,7 @@ class GRetriever(torch.nn.Module):
         edge_index: Tensor,
         batch: Tensor,
         edge_attr: Optional[Tensor],
+        ptr: Optional[Tensor] = None,
     ) -> Tensor:
         x = x.to(self.llm.device)
         edge_index = edge_index.to(self.llm.device)
@@ -111,6 +112,11 @@ class GRetriever(torch.nn.Module):
             model_specific_kwargs['edge_attr'] = edge_attr
 
         out = self.gnn(x, edge_index, **model_specific_kwargs)
+        if ptr is not None:
+            # The standard DataLoader collation yields a monotonically
+            # non-decreasing batch vector, so pooling can use a segment
+            # reduction instead of an atomic scatter:
+            return segment(out, ptr.to(self.llm.device), reduce='mean')
         return scatter(out, batch, dim=0, reduce='mean')
 
     def forward(
@@ -122,6 +128,7 @@ class GRetriever(torch.nn.Module):
         label: List[str],
         edge_attr: Optional[Tensor] = None,
         additional_text_context: Optional[List[str]] = None,
+        ptr: Optional[Tensor] = None,
     ):
         r"""The forward pass.
 
@@ -138,10 +145,14 @@ class GRetriever(torch.nn.Module):
             additional_text_context (List[str], optional): Additional context
                 to give to the LLM, such as textified knowledge graphs.
                 (default: :obj:`None`)
+            ptr (torch.Tensor, optional): The pointer vector denoting the
+                boundaries between examples in :obj:`batch`, which enables a
+                segment-based pooling instead of an atomic scatter.
+                (default: :obj:`None`)
         """
         xs = None
         if self.gnn is not None:
-            x = self.encode(x, edge_index, batch, edge_attr)
+            x = self.encode(x, edge_index, batch, edge_attr, ptr)
             x = self.projector(x)
             x = self._align_dtype(x, self.llm_generator)
             xs = x.split(1, dim=0)
@@ -186,6 +197,7 @@ class GRetriever(torch.nn.Module):
         edge_attr: Optional[Tensor] = None,
         additional_text_context: Optional[List[str]] = None,
         max_out_tokens: Optional[int] = MAX_NEW_TOKENS,
+        ptr: Optional[Tensor] = None,
     ):
         r"""The inference pass.
 
@@ -203,10 +215,14 @@ class GRetriever(torch.nn.Module):
                 (default: :obj:`None`)
             max_out_tokens (int, optional): How many tokens for the LLM to
                 generate. (default: :obj:`32`)
+            ptr (torch.Tensor, optional): The pointer vector denoting the
+                boundaries between examples in :obj:`batch`, which enables a
+                segment-based pooling instead of an atomic scatter.
+                (default: :obj:`None`)
         """
         xs = None
         if self.gnn is not None:
-            x = self.encode(x, edge_index, batch, edge_attr)
+            x = self.encode(x, edge_index, batch, edge_attr, ptr)
             x = self.projector(x)
             xs = x.split(1, dim=0)
 
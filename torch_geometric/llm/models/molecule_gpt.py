@@ -104,11 +104,16 @@ class MoleculeGPT(torch.nn.Module):
     ) -> Tensor:
         batch_size = len(smiles)
         # 2D Graph Branch: [bs, node_len, d]
-        x = x.to(self.llm.device)
-        edge_index = edge_index.to(self.llm.device)
-        if edge_attr is not None:
-            edge_attr = edge_attr.to(self.llm.device)
-        batch = batch.to(self.llm.device)
+        # Asynchronous host-to-device copies overlap with compute of the
+        # previous step when the DataLoader is created with pin_memory=True:
+        if x.device != self.llm.device:
+            x = x.to(self.llm.device, non_blocking=True)
+        if edge_index.device != self.llm.device:
+            edge_index = edge_index.to(self.llm.device, non_blocking=True)
+        if edge_attr is not None and edge_attr.device != self.llm.device:
+            edge_attr = edge_attr.to(self.llm.device, non_blocking=True)
+        if batch.device != self.llm.device:
+            batch = batch.to(self.llm.device, non_blocking=True)
 
         x_graph = self.graph_encoder(x, edge_index, edge_attr=edge_attr)
         x_graph = to_dense_batch(x_graph, batch)[0]
@@ -142,6 +147,7 @@ class MoleculeGPT(torch.nn.Module):
     ):
         x = self.encode(x, edge_index, batch, edge_attr, smiles)
         x = self.projector(x)
+        x = self._align_dtype(x, self.llm_generator)
         xs = x.split(1, dim=0)
 
         batch_unique = batch.unique()
@@ -182,6 +188,7 @@ class MoleculeGPT(torch.nn.Module):
     ):
         x = self.encode(x, edge_index, batch, edge_attr, smiles)
         x = self.projector(x)
+        x = self._align_dtype(x, self.llm_generator)
         xs = x.split(1, dim=0)
 
         # Handle questions without node features:
@@ -214,9 +221,45 @@ class MoleculeGPT(torch.nn.Module):
             skip_special_tokens=True,
         )
 
+    def wrap_ddp(
+        self,
+        device_ids: Optional[List[int]] = None,
+        **kwargs,
+    ) -> torch.nn.Module:
+        r"""Wraps the model in
+        :class:`torch.nn.parallel.DistributedDataParallel` with gradient
+        bucketing tuned for overlapping the backward all-reduce with
+        backward compute.
+
+        Parameters with :obj:`requires_grad=False` (*e.g.*, a frozen LLM)
+        are excluded from gradient bucketing by DDP itself, so freeze the
+        LLM before calling this method if it is not being trained.
+
+        Args:
+            device_ids (List[int], optional): The CUDA devices to replicate
+                the module on. (default: :obj:`None`)
+            **kwargs (optional): Additional arguments of
+                :class:`torch.nn.parallel.DistributedDataParallel`.
+        """
+        from torch.nn.parallel import DistributedDataParallel
+        kwargs.setdefault('gradient_as_bucket_view', True)
+        kwargs.setdefault('find_unused_parameters', False)
+        kwargs.setdefault('bucket_cap_mb', 25)
+        return DistributedDataParallel(self, device_ids=device_ids, **kwargs)
+
     def __repr__(self) -> str:
         return (f'{self.__class__.__name__}(\n'
                 f'  llm={self.llm},\n'
                 f'  graph={self.graph_encoder.__class__.__name__},\n'
                 f'  smiles={self.smiles_encoder},\n'
                 f')')
+
+    def _align_dtype(
+        self,
+        x: Tensor,
+        llm_generator: torch.nn.Module,
+    ) -> Tensor:
+        llm_dtype = next(iter(llm_generator.parameters())).dtype
+        if x.dtype != llm_dtype:
+            x = x.to(llm_dtype)
+        return x
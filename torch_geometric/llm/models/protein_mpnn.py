@@ -1,5 +1,5 @@
 from itertools import product
-from typing import Tuple
+from typing import List, Optional, Tuple
 
 import torch
 import torch.nn.functional as F
@@ -331,3 +331,25 @@ class ProteinMPNN(torch.nn.Module):
 
         logits = self.output(h_v)
         return F.log_softmax(logits, dim=-1)
+
+    def wrap_ddp(
+        self,
+        device_ids: Optional[List[int]] = None,
+        **kwargs,
+    ) -> torch.nn.Module:
+        r"""Wraps the model in
+        :class:`torch.nn.parallel.DistributedDataParallel` with gradient
+        bucketing tuned for overlapping the backward all-reduce with
+        backward compute.
+
+        Args:
+            device_ids (List[int], optional): The CUDA devices to replicate
+                the module on. (default: :obj:`None`)
+            **kwargs (optional): Additional arguments of
+                :class:`torch.nn.parallel.DistributedDataParallel`.
+        """
+        from torch.nn.parallel import DistributedDataParallel
+        kwargs.setdefault('gradient_as_bucket_view', True)
+        kwargs.setdefault('find_unused_parameters', False)
+        kwargs.setdefault('bucket_cap_mb', 25)
+        return DistributedDataParallel(self, device_ids=device_ids, **kwargs)
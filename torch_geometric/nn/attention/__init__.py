@@ -2,10 +2,13 @@ from .performer import PerformerAttention
 from .qformer import QFormer
 from .sgformer import SGFormerAttention
 from .polynormer import PolynormerAttention
+from .bigbird import BigBirdAttention, BigBirdEncoder
 
 __all__ = classes = [
     'PerformerAttention',
     'QFormer',
     'SGFormerAttention',
     'PolynormerAttention',
+    'BigBirdAttention',
+    'BigBirdEncoder',
 ]
@@ -0,0 +1,311 @@
+import math
+from typing import Optional, Tuple
+
+import torch
+import torch.nn.functional as F
+from torch import Tensor
+
+
+def pad_to_block_size(
+    x: Tensor,
+    mask: Tensor,
+    block_size: int,
+) -> Tuple[int, Tensor, Tensor]:
+    r"""Pads the sequence and its mask to a multiple of :obj:`block_size`.
+
+    Args:
+        x (torch.Tensor): Input tensor
+            :math:`\mathbf{X} \in \mathbb{R}^{B \times N \times F}`.
+        mask (torch.Tensor): Mask matrix
+            :math:`\mathbf{M} \in {\{ 0, 1 \}}^{B \times N}` indicating
+            the valid tokens of each sequence.
+        block_size (int): Size of the attention blocks.
+    """
+    seq_length = x.size(1)
+    padding_len = (block_size - seq_length % block_size) % block_size
+    if padding_len == 0:  # Return unchanged without any tensor op:
+        return 0, x, mask
+    x = F.pad(x, (0, 0, 0, padding_len))
+    mask = F.pad(mask, (0, padding_len), value=False)
+    return padding_len, x, mask
+
+
+def create_band_mask_from_inputs(
+    from_blocked_mask: Tensor,
+    to_blocked_mask: Tensor,
+) -> Tensor:
+    r"""Creates a 3-block band mask from the blocked masks.
+
+    The band mask is boolean-valued, so it is encoded as :obj:`torch.uint8`
+    via a broadcast-multiply and only cast to floating point when it is
+    multiplied into the attention logits.
+
+    Args:
+        from_blocked_mask (torch.Tensor): Blocked mask of shape
+            :obj:`[batch_size, num_blocks, block_size]` for queries.
+        to_blocked_mask (torch.Tensor): Blocked mask of shape
+            :obj:`[batch_size, num_blocks, block_size]` for keys.
+    """
+    batch_size, num_blocks, block_size = to_blocked_mask.size()
+    if num_blocks < 5:  # Unused by the full-attention fallback:
+        return to_blocked_mask.new_zeros(
+            (batch_size, 1, 0, block_size, 3 * block_size),
+            dtype=torch.uint8)
+
+    # Gather the overlapping 3-block windows as a strided view instead of
+    # concatenating three shifted slices:
+    windows = to_blocked_mask.unfold(1, 3, 1)  # [B, nb-2, bs, 3]
+    windows = windows[:, 1:-1]  # [B, nb-4, bs, 3]
+    exp_blocked_to_pad = windows.permute(0, 1, 3, 2).reshape(
+        batch_size, num_blocks - 4, 3 * block_size)
+    band_mask = (from_blocked_mask[:, 2:-2].unsqueeze(-1).to(torch.uint8) *
+                 exp_blocked_to_pad.unsqueeze(-2).to(torch.uint8))
+    band_mask.unsqueeze_(1)
+    return band_mask
+
+
+def create_masks_for_block_sparse_attn(
+    mask: Tensor,
+    block_size: int,
+) -> Tuple[Tensor, Tensor, Tensor, Tensor]:
+    r"""Creates the blocked, band, query and key masks used by the
+    block-sparse attention.
+
+    Args:
+        mask (torch.Tensor): Mask matrix
+            :math:`\mathbf{M} \in {\{ 0, 1 \}}^{B \times N}` with :math:`N`
+            being a multiple of :obj:`block_size`.
+        block_size (int): Size of the attention blocks.
+    """
+    batch_size, seq_length = mask.size()
+    assert seq_length % block_size == 0
+
+    blocked_mask = mask.view(batch_size, seq_length // block_size, block_size)
+    band_mask = create_band_mask_from_inputs(blocked_mask, blocked_mask)
+    from_mask = mask.view(batch_size, 1, seq_length, 1)
+    to_mask = mask.view(batch_size, 1, 1, seq_length)
+    return blocked_mask, band_mask, from_mask, to_mask
+
+
+class BigBirdAttention(torch.nn.Module):
+    r"""The sparse attention mechanism from the `"Big Bird: Transformers for
+    Longer Sequences" <https://arxiv.org/abs/2007.14062>`_ paper.
+
+    Queries attend to a sliding window of three blocks around their own
+    block, while the first and last blocks attend (and are attended to)
+    globally. Sequences shorter than five blocks fall back to full attention.
+
+    Args:
+        channels (int): Size of each input sample.
+        heads (int, optional): Number of parallel attention heads.
+        head_channels (int, optional): Size of each attention head.
+            (default: :obj:`64`)
+        block_size (int, optional): Size of the attention blocks.
+            (default: :obj:`4`)
+        qkv_bias (bool, optional): If specified, add bias to query, key
+            and value in the self attention. (default: :obj:`False`)
+        attn_out_bias (bool, optional): If specified, add bias to the
+            attention output. (default: :obj:`True`)
+        dropout (float, optional): Dropout probability of the attention
+            weights. (default: :obj:`0.0`)
+    """
+    def __init__(
+        self,
+        channels: int,
+        heads: int,
+        head_channels: int = 64,
+        block_size: int = 4,
+        qkv_bias: bool = False,
+        attn_out_bias: bool = True,
+        dropout: float = 0.0,
+    ):
+        super().__init__()
+        assert channels % heads == 0
+        if head_channels is None:
+            head_channels = channels // heads
+
+        self.heads = heads
+        self.head_channels = head_channels
+        self.block_size = block_size
+
+        inner_channels = head_channels * heads
+        # A single fused projection issues one large matmul instead of three:
+        self.qkv = torch.nn.Linear(channels, 3 * inner_channels,
+                                   bias=qkv_bias)
+        self.attn_out = torch.nn.Linear(inner_channels, channels,
+                                        bias=attn_out_bias)
+        self.dropout = torch.nn.Dropout(dropout)
+
+    def transpose_for_scores(self, x: Tensor) -> Tensor:
+        B, N, _ = x.shape
+        x = x.view(B, N, self.heads, self.head_channels)
+        return x.permute(0, 2, 1, 3)
+
+    def _sparsity_pattern(
+        self,
+        band_mask: Tensor,
+        from_mask: Tensor,
+        to_mask: Tensor,
+    ) -> Tensor:
+        r"""Assembles the dense :obj:`uint8` attention pattern of shape
+        :obj:`[batch_size, 1, seq_length, seq_length]` from the band and
+        padding masks.
+        """
+        bs = self.block_size
+        num_blocks = from_mask.size(2) // bs
+        pair_mask = from_mask.to(torch.uint8) * to_mask.to(torch.uint8)
+        if num_blocks < 5:  # Fall back to full attention:
+            return pair_mask
+
+        pattern = torch.zeros_like(pair_mask)
+        # Global attention of the first and last blocks:
+        pattern[:, :, :bs, :] = pair_mask[:, :, :bs, :]
+        pattern[:, :, -bs:, :] = pair_mask[:, :, -bs:, :]
+        pattern[:, :, :, :bs] = pair_mask[:, :, :, :bs]
+        pattern[:, :, :, -bs:] = pair_mask[:, :, :, -bs:]
+        # Sliding windows overlapping with the global blocks:
+        pattern[:, :, bs:2 * bs, :3 * bs] = pair_mask[:, :, bs:2 * bs,
+                                                      :3 * bs]
+        pattern[:, :, -2 * bs:-bs, -3 * bs:] = pair_mask[:, :, -2 * bs:-bs,
+                                                         -3 * bs:]
+        # Banded sliding window of the middle blocks:
+        for w, i in enumerate(range(2, num_blocks - 2)):
+            pattern[:, :, i * bs:(i + 1) * bs,
+                    (i - 1) * bs:(i + 2) * bs] = band_mask[:, :, w]
+        return pattern
+
+    def _attn_bias(
+        self,
+        band_mask: Tensor,
+        from_mask: Tensor,
+        to_mask: Tensor,
+    ) -> Tensor:
+        r"""Converts the :obj:`uint8` sparsity pattern into an additive
+        floating point bias for the attention logits.
+        """
+        pattern = self._sparsity_pattern(band_mask, from_mask, to_mask)
+        return -10000.0 * (1.0 - pattern.float())
+
+    def _attend(self, x: Tensor, attn_bias: Tensor) -> Tensor:
+        B, N, _ = x.shape
+        q, k, v = self.qkv(x).chunk(3, dim=-1)
+        query_layer, key_layer, value_layer = map(self.transpose_for_scores,
+                                                  (q, k, v))
+
+        scores = query_layer @ key_layer.transpose(-2, -1)
+        scores = scores / math.sqrt(self.head_channels)
+        scores = scores + attn_bias.to(scores.dtype)
+
+        attn = F.softmax(scores, dim=-1)
+        attn = self.dropout(attn)
+        out = attn @ value_layer
+        out = out.permute(0, 2, 1, 3).reshape(B, N, -1)
+        return self.attn_out(out)
+
+    def forward(self, x: Tensor, mask: Optional[Tensor] = None) -> Tensor:
+        r"""Forward pass.
+
+        Args:
+            x (torch.Tensor): Node feature tensor
+                :math:`\mathbf{X} \in \mathbb{R}^{B \times N \times F}`, with
+                batch-size :math:`B`, (maximum) number of nodes :math:`N` for
+                each graph, and feature dimension :math:`F`.
+            mask (torch.Tensor, optional): Mask matrix
+                :math:`\mathbf{M} \in {\{ 0, 1 \}}^{B \times N}` indicating
+                the valid nodes for each graph. (default: :obj:`None`)
+        """
+        B, N, *_ = x.shape
+        if mask is None:
+            mask = x.new_ones(B, N, dtype=torch.bool)
+
+        padding_len, x, mask = pad_to_block_size(x, mask, self.block_size)
+        _, band_mask, from_mask, to_mask = create_masks_for_block_sparse_attn(
+            mask, self.block_size)
+
+        out = self._attend(x, self._attn_bias(band_mask, from_mask, to_mask))
+        if padding_len > 0:
+            out = out[:, :N]
+        return out
+
+    def _reset_parameters(self):
+        self.qkv.reset_parameters()
+        self.attn_out.reset_parameters()
+
+    def __repr__(self) -> str:
+        return (f'{self.__class__.__name__}('
+                f'heads={self.heads}, '
+                f'head_channels={self.head_channels}, '
+                f'block_size={self.block_size})')
+
+
+class BigBirdEncoder(torch.nn.Module):
+    r"""A stack of :class:`BigBirdAttention` layers that pads the input and
+    builds the block-sparse masks once for all layers.
+
+    Args:
+        channels (int): Size of each input sample.
+        heads (int, optional): Number of parallel attention heads.
+        num_layers (int, optional): Number of attention layers.
+            (default: :obj:`1`)
+        block_size (int, optional): Size of the attention blocks.
+            (default: :obj:`4`)
+        **kwargs (optional): Additional arguments of
+            :class:`BigBirdAttention`.
+    """
+    def __init__(
+        self,
+        channels: int,
+        heads: int,
+        num_layers: int = 1,
+        block_size: int = 4,
+        **kwargs,
+    ):
+        super().__init__()
+        self.block_size = block_size
+        self.layers = torch.nn.ModuleList([
+            BigBirdAttention(channels, heads, block_size=block_size, **kwargs)
+            for _ in range(num_layers)
+        ])
+        self._mask_cache: Optional[Tuple[Tensor, Tensor]] = None
+
+    def forward(self, x: Tensor, mask: Optional[Tensor] = None) -> Tensor:
+        B, N, *_ = x.shape
+        if mask is None:
+            mask = x.new_ones(B, N, dtype=torch.bool)
+
+        # The attention bias only depends on (mask, block_size), so it is
+        # cached and shared across layers and repeated forwards. The cached
+        # mask is kept alive and compared by value, since allocators recycle
+        # freed storage and pointer identity alone is unsound:
+        attn_bias: Optional[Tensor] = None
+        if self._mask_cache is not None:
+            cached_mask, cached_bias = self._mask_cache
+            if (cached_mask.shape == mask.shape
+                    and cached_mask.device == mask.device
+                    and torch.equal(cached_mask, mask)):
+                attn_bias = cached_bias
+
+        padding_len, x, padded_mask = pad_to_block_size(
+            x, mask, self.block_size)
+        if attn_bias is None:
+            _, band_mask, from_mask, to_mask = \
+                create_masks_for_block_sparse_attn(padded_mask,
+                                                   self.block_size)
+            attn_bias = self.layers[0]._attn_bias(band_mask, from_mask,
+                                                  to_mask)
+            self._mask_cache = (mask, attn_bias)
+
+        for layer in self.layers:
+            x = x + layer._attend(x, attn_bias)
+        if padding_len > 0:
+            x = x[:, :N]
+        return x
+
+    def _reset_parameters(self):
+        for layer in self.layers:
+            layer._reset_parameters()
+
+    def __repr__(self) -> str:
+        return (f'{self.__class__.__name__}('
+                f'num_layers={len(self.layers)}, '
+                f'block_size={self.block_size})')
@@ -2,10 +2,12 @@ from .base import CuGraphModule
 from .sage_conv import CuGraphSAGEConv
 from .gat_conv import CuGraphGATConv
 from .rgcn_conv import CuGraphRGCNConv
+from .tag_conv import CuGraphTAGConv
 
 __all__ = [
     'CuGraphModule',
     'CuGraphSAGEConv',
     'CuGraphGATConv',
     'CuGraphRGCNConv',
+    'CuGraphTAGConv',
 ]
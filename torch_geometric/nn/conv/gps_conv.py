@@ -6,7 +6,7 @@ import torch.nn.functional as F
 from torch import Tensor
 from torch.nn import Dropout, Linear, Sequential
 
-from torch_geometric.nn.attention import PerformerAttention
+from torch_geometric.nn.attention import BigBirdAttention, PerformerAttention
 from torch_geometric.nn.conv import MessagePassing
 from torch_geometric.nn.inits import reset
 from torch_geometric.nn.resolver import (
@@ -54,8 +54,8 @@ class GPSConv(torch.nn.Module):
         norm_kwargs (Dict[str, Any], optional): Arguments passed to the
             respective normalization function defined by :obj:`norm`.
             (default: :obj:`None`)
-        attn_type (str): Global attention type, :obj:`multihead` or
-            :obj:`performer`. (default: :obj:`multihead`)
+        attn_type (str): Global attention type, :obj:`multihead`,
+            :obj:`performer` or :obj:`bigbird`. (default: :obj:`multihead`)
         attn_kwargs (Dict[str, Any], optional): Arguments passed to the
             attention layer. (default: :obj:`None`)
     """
@@ -94,8 +94,13 @@ class GPSConv(torch.nn.Module):
                 heads=heads,
                 **attn_kwargs,
             )
+        elif attn_type == 'bigbird':
+            self.attn = BigBirdAttention(
+                channels=channels,
+                heads=heads,
+                **attn_kwargs,
+            )
         else:
-            # TODO: Support BigBird
             raise ValueError(f'{attn_type} is not supported')
 
         self.mlp = Sequential(
@@ -155,7 +160,7 @@ class GPSConv(torch.nn.Module):
         if isinstance(self.attn, torch.nn.MultiheadAttention):
             h, _ = self.attn(h, h, h, key_padding_mask=~mask,
                              need_weights=False)
-        elif isinstance(self.attn, PerformerAttention):
+        elif isinstance(self.attn, (PerformerAttention, BigBirdAttention)):
             h = self.attn(h, mask=mask)
 
         h = h[mask]